@@ -11,19 +11,18 @@ import os
 import traceback
 import importlib
 from collections import OrderedDict
-from aqt import mw
 from aqt.utils import showText
 
 
-from .utils import CONFIG, register_addon_tool, build_config_tools 
-import json
+from .utils import CONFIG, TOOLBAR_TITLE, register_addon_tool, register_addon_tools, build_config_tools, load_json_cached, get_toolbar_menu, batch_register
 
-# Local definition to ensure UTF-8 reading for JSON files
-def load_json_file(path):
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
-from .assets.config_ui import ConfigDialog
-from .assets.config_manager import ConfigManager
+# ? main_window_did_init can fire again (e.g. add-on reload); these keep registration one-shot
+_TOOLS_INSTALLED = False
+_CONFIGS_INSTALLED = False
+
+# Entries that are editor-only decorations, never menu actions
+_NON_ACTION_TYPES = frozenset(("separator", "label"))
+_SEPARATOR_NAMES = frozenset(("separator", "\u2014\u2014\u2014"))
 
 
 # * Hard-coded "Toolbar Settings" action kept out of actions.json
@@ -43,7 +42,7 @@ def register_hardcoded_toolbar_settings(order_index=None):
     register_addon_tool(
         name="Toolbar Settings",
         callback=_open_toolbar_settings,
-        submenu_name=CONFIG.get("toolbar_title", "Custom Tools"),
+        submenu_name=TOOLBAR_TITLE,
         icon="icons/bent_menu-burger.png",
         enabled=True,
         order_index=order_index,  # ^ allow explicit placement
@@ -61,15 +60,20 @@ def load_other_configs():
     # Skip if toolbar settings are disabled in the config.
     # Exit early if toolbar settings are disabled in the config
     # This flag controls whether the 'Other Add-ons Configurations' submenu is shown
+    global _CONFIGS_INSTALLED
     if not CONFIG.get("enable_toolbar_settings", False):
         return
-
+    if _CONFIGS_INSTALLED:
+        return
 
     # Generates a function to open the config dialog for a given add-on name.
     # Returns a function that opens the config dialog for a specific add-on
     # This closure allows each menu item to open the correct add-on's config dialog
     def make_open_fn(addon_name):
         def _open():
+            # ^ Imported on first click so startup never loads the dialog stack
+            from .assets.config_ui import ConfigDialog
+            from .assets.config_manager import ConfigManager
             dlg = ConfigDialog(addon_name, ConfigManager)
             dlg.exec_()
         return _open
@@ -79,36 +83,30 @@ def load_other_configs():
         config_tools = build_config_tools(CONFIG, make_open_fn)
 
 
-        # Locate the custom toolbar menu already present in the Anki Tools menu.
-        custom_tools_menu = None
-        for action in mw.form.menubar.actions():
-            if action.menu() and action.menu().title() == CONFIG.get("toolbar_title", "Custom Tools"):
-                custom_tools_menu = action.menu()
-                break
+        # Reuse the custom toolbar menu handle cached by the last menu refresh.
+        custom_tools_menu = get_toolbar_menu(TOOLBAR_TITLE)
 
         if not custom_tools_menu:
             return
 
-        # Register each tool using the unified system so it appears under the correct menu
-        for tool in config_tools:
-            register_addon_tool(
-                name=tool["name"],
-                callback=tool["callback"],
-                submenu_name=CONFIG.get("toolbar_title", "Custom Tools") + "::Add-ons Configurations",
-                icon=tool["icon"],
-                enabled=tool["enabled"]
-            )
+        # Register the tools together so the menus are rebuilt once, under "<toolbar>::Add-ons Configurations"
+        register_addon_tools(config_tools)
+        _CONFIGS_INSTALLED = True
 
     except Exception:
         err = traceback.format_exc()
         showText(
             f"[Custom Tools] Failed to load Other Add-ons Configurations menu:\n\n{err}",
-            title=CONFIG.get("toolbar_title", "Custom Tools") + " Error"
+            title=TOOLBAR_TITLE + " Error"
         )
 
 # Main function to dynamically load functional tools defined in actions.json and add to the toolbar.
 # Dynamically loads and registers tools from actions.json file.
 def load_tools_from_config():
+    global _TOOLS_INSTALLED
+    if _TOOLS_INSTALLED:
+        return
+
     # Define and check path to the actions.json configuration file.
     tools_path = os.path.join(os.path.dirname(__file__), "assets", "actions.json")
    
@@ -116,8 +114,10 @@ def load_tools_from_config():
     if not os.path.exists(tools_path):
         return
 
-    # Load and parse the JSON file containing tool definitions
-    tools = load_json_file(tools_path)
+    # Load tool definitions (marshal sidecar is reused until actions.json changes)
+    tools = load_json_cached(tools_path)
+
+    submenu_prefix = TOOLBAR_TITLE + "::"
 
     # ! Build an ordered manifest: { submenu_name: [entries...] } in file order
     manifest: OrderedDict[str, list[dict]] = OrderedDict()
@@ -128,13 +128,11 @@ def load_tools_from_config():
         if not name:
             continue
         # Skip separators/labels for menu registration (editor handles those)
-        if entry_type in ("separator", "label") or name == "separator" or name == "\u2014\u2014\u2014":
+        if entry_type in _NON_ACTION_TYPES or name in _SEPARATOR_NAMES:
             continue
 
         raw_submenu = (entry.get("submenu") or "").strip()
-        submenu_name = CONFIG.get("toolbar_title", "Custom Tools")
-        if raw_submenu:
-            submenu_name += f"::{raw_submenu}"
+        submenu_name = submenu_prefix + raw_submenu if raw_submenu else TOOLBAR_TITLE
 
         func_name = entry.get("function")
         module_path = entry.get("module")
@@ -146,27 +144,33 @@ def load_tools_from_config():
         manifest[submenu_name].append(entry)
 
     # ^ Register entries by position within each submenu (no sorting)
-    for submenu_name, entries in manifest.items():
-        for idx, entry in enumerate(entries):
-            try:
-                module = importlib.import_module(entry["module"])
-                callback = getattr(module, entry["function"])
-            except Exception:
-                err = traceback.format_exc()
-                showText(
-                    f"[Custom Tools] Failed to import '{entry['name']}' from {entry['module']}.{entry['function']}:\n\n{err}",
-                    title=CONFIG.get("toolbar_title", "Custom Tools") + " Error"
+    # Hold menu updates until every entry is registered, then rebuild once
+    with batch_register():
+        modules = {}  # module path -> imported module, so shared modules resolve once
+        for submenu_name, entries in manifest.items():
+            for idx, entry in enumerate(entries):
+                try:
+                    module = modules.get(entry["module"])
+                    if module is None:
+                        module = modules[entry["module"]] = importlib.import_module(entry["module"])
+                    callback = getattr(module, entry["function"])
+                except Exception:
+                    err = traceback.format_exc()
+                    showText(
+                        f"[Custom Tools] Failed to import '{entry['name']}' from {entry['module']}.{entry['function']}:\n\n{err}",
+                        title=TOOLBAR_TITLE + " Error"
+                    )
+                    continue
+
+                register_addon_tool(
+                    name=entry["name"],
+                    callback=callback,
+                    submenu_name=submenu_name,
+                    icon=entry.get("icon"),
+                    enabled=entry.get("enabled", True),
+                    order_index=idx,  # ! explicit position from file order
                 )
-                continue
-
-            register_addon_tool(
-                name=entry["name"],
-                callback=callback,
-                submenu_name=submenu_name,
-                icon=entry.get("icon"),
-                enabled=entry.get("enabled", True),
-                order_index=idx,  # ! explicit position from file order
-            )
-
-    # Add hard-coded item last (or pass an index to place it)
-    register_hardcoded_toolbar_settings()
\ No newline at end of file
+
+        # Add hard-coded item last (or pass an index to place it)
+        register_hardcoded_toolbar_settings()
+    _TOOLS_INSTALLED = True
\ No newline at end of file
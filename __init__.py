@@ -1,5 +1,4 @@
 # pyright: reportMissingImports=false
-from .utils import CONFIG, register_addon_tool
 from .Run_add_ons import load_tools_from_config, load_other_configs
 
 # Load all tools and config dialogs
@@ -1,15 +1,28 @@
 import json
 import os
-from aqt.qt import (
-    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextBrowser,
-    QSplitter, Qt, QWidget, QTextEdit
-)
+import functools
+from aqt.qt import QDialog
 from aqt import mw
-import markdown
 from aqt.utils import showInfo
 
+from ..utils import load_json_file
+
+
+@functools.lru_cache(maxsize=16)
+def _render_guide(path, mtime):
+    """Render a config.md guide to HTML; keyed on mtime so edits invalidate it."""
+    # ^ markdown is imported lazily so add-on startup never pays for it
+    import markdown
+    with open(path, "r", encoding="utf-8") as file:
+        return markdown.markdown(file.read())
+
 class ConfigDialog(QDialog):
     def __init__(self, addon_name: str, config_manager_cls, parent=None):
+        # Widget classes are only needed once a dialog is actually opened
+        from aqt.qt import (
+            QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextBrowser,
+            QSplitter, Qt, QWidget, QTextEdit
+        )
         super().__init__(parent or mw)
         # Initialize dialog window with title and modality
         self.setWindowTitle(f"{addon_name} Add-on Configuration")
@@ -18,6 +31,7 @@ class ConfigDialog(QDialog):
         self.setGeometry(200, 200, 850, 1000)
 
         self.addon_name = addon_name
+        self._addon_dir = os.path.join(mw.addonManager.addonsFolder(), self.addon_name)
         self.config_manager = config_manager_cls(self.addon_name)
 
         main_layout = QHBoxLayout()
@@ -106,32 +120,33 @@ class ConfigDialog(QDialog):
 
     def load_guide(self):
         # Try to load 'config.md' for help panel from the add-on folder
-        guide_path = os.path.join(mw.addonManager.addonsFolder(), self.addon_name, "config.md")
+        guide_path = os.path.join(self._addon_dir, "config.md")
         try:
-            with open(guide_path, "r", encoding="utf-8") as file:
-                return markdown.markdown(file.read())
+            return _render_guide(guide_path, os.path.getmtime(guide_path))
         except FileNotFoundError:
             return "<b>Configuration Guide Not Found.</b>"
 
     def save_config(self):
         # Save user-edited config after validating JSON
         try:
-            new_config = json.loads(self.config_editor.toPlainText())
+            original_text = self.config_editor.toPlainText()
+            new_config = json.loads(original_text)
             self.config_manager.save_config(new_config)
-            self.config_editor.setPlainText(json.dumps(new_config, indent=4))
+            # Only reset the editor (and its cursor/scroll) if formatting actually changed
+            normalized = json.dumps(new_config, indent=4)
+            if normalized != original_text:
+                self.config_editor.setPlainText(normalized)
             showInfo("Configuration Saved!")
         except json.JSONDecodeError:
             showInfo("Error: Invalid JSON format. Please check your input.")
 
     def restore_defaults(self):
         # Load config.json from assets/ first, fallback to root
-        addon_path = os.path.join(mw.addonManager.addonsFolder(), self.addon_name)
-        assets_path = os.path.join(addon_path, "assets", "config.json")
-        default_path = os.path.join(addon_path, "config.json")
+        assets_path = os.path.join(self._addon_dir, "assets", "config.json")
+        default_path = os.path.join(self._addon_dir, "config.json")
         config_path = assets_path if os.path.exists(assets_path) else default_path
         try:
-            with open(config_path, "r", encoding="utf-8") as file:
-                default_config = json.load(file)
+            default_config = load_json_file(config_path)
             self.config_manager.save_config(default_config)
             self.config_editor.setPlainText(json.dumps(default_config, indent=4))
             showInfo("Defaults Restored.")
@@ -5,6 +5,9 @@ let _draggingEl = null; // currently dragged <tr> element
 let _markerEl = null; // visual insertion marker row
 let _isDragging = false;       // pointer-driven drag active
 let _dragStartIndex = null;    // index of the row where drag began
+let _dndBound = false;         // drag listeners attached (once per page)
+let _moveRaf = null;           // pending requestAnimationFrame id for marker moves
+let _lastMoveY = 0;            // latest pointer Y seen during a drag
 
 function _ensureDndStyles() {
   if (document.getElementById('mt-dnd-style')) return;
@@ -44,8 +47,9 @@ function getDragAfterElement(tbody, y) {
 }
 
 function _getColCount() {
-  const first = document.querySelector('#tbody tr');
-  if (first) return first.children.length || 7;
+  // Count from the header: divider rows in the body span several columns with one cell
+  const head = document.querySelector('thead tr');
+  if (head) return head.children.length || 7;
   return 7;
 }
 
@@ -74,11 +78,106 @@ function _removeMarker() {
   }
 }
 
+function _onDragMouseDown(e) {
+  const tbody = e.currentTarget;
+  const handle = e.target.closest('.drag-handle');
+  if (!handle) return; // only start from handle
+  const tr = handle.closest('tr.tool-row');
+  if (!tr) return;
+  if (tr.dataset.type === 'separator') return; // no dragging separators
+
+  _isDragging = true;
+  _dragStartIndex = +tr.dataset.index;
+  _draggingEl = tr;
+  tr.classList.add('dragging');
+  document.body.classList.add('mt-grabbing');
+
+  // show marker just after the current row initially
+  _placeMarkerBefore(tbody, tr.nextElementSibling);
+  e.preventDefault();
+}
+
+function _placeMarkerAt(y) {
+  const tbody = document.getElementById('tbody');
+  if (!tbody) return;
+  _placeMarkerBefore(tbody, getDragAfterElement(tbody, y));
+}
+
+// move marker with pointer; at most one layout pass per animation frame
+function _onDragMouseMove(e) {
+  if (!_isDragging || !_draggingEl) return;
+  _lastMoveY = e.clientY;
+  if (_moveRaf !== null) return;
+  _moveRaf = requestAnimationFrame(() => {
+    _moveRaf = null;
+    if (_isDragging) _placeMarkerAt(_lastMoveY);
+  });
+}
+
+// commit on mouse up anywhere
+function _onDragMouseUp(e) {
+  if (!_isDragging || !_draggingEl) return;
+
+  // flush a pending marker move so the drop lands where the pointer was last seen
+  if (_moveRaf !== null) {
+    cancelAnimationFrame(_moveRaf);
+    _moveRaf = null;
+    _placeMarkerAt(_lastMoveY);
+  }
+
+  _isDragging = false;
+
+  const tbody = document.getElementById('tbody');
+  const rows = [...tbody.querySelectorAll('tr.tool-row')];
+  let insertIndex = rows.length; // default to end
+  if (_markerEl && _markerEl.parentNode === tbody) {
+    const next = _markerEl.nextElementSibling;
+    if (next && next.classList.contains('tool-row')) {
+      insertIndex = rows.indexOf(next);
+    }
+  }
+
+  const from = _dragStartIndex;
+  let to = insertIndex;
+  if (from < to) to -= 1;
+
+  const [moved] = model.splice(from, 1);
+  model.splice(to, 0, moved);
+
+  if (_draggingEl) _draggingEl.classList.remove('dragging');
+  _draggingEl = null;
+  _dragStartIndex = null;
+  document.body.classList.remove('mt-grabbing');
+  _removeMarker();
+
+  // re-render and select moved row
+  render();
+  selectRow(to);
+}
+
+function _bindDragHandlers(tbody) {
+  // tbody survives re-renders (only its innerHTML changes), so bind once
+  if (_dndBound) return;
+  _dndBound = true;
+  tbody.addEventListener('mousedown', _onDragMouseDown);
+  document.addEventListener('mousemove', _onDragMouseMove);
+  document.addEventListener('mouseup', _onDragMouseUp);
+}
+
 function rowHtml(r, i) {
   const esc = s => (s ?? "").toString().replace(/&/g,"&amp;").replace(/</g,"&lt;");
   const isSep = (r.type === "separator") || (r.name === "———");
+  if (isSep) {
+    // Dividers have no editable fields: one spanned cell instead of six inputs
+    return `
+    <tr class="tool-row" data-index="${i}" data-type="separator">
+      <td class="drag-cell"></td>
+      <td class="divider-cell" colspan="6">↕ Divider</td>
+    </tr>
+  `;
+  }
   return `
-    <tr class="tool-row" data-index="${i}" data-type="${isSep ? "separator" : "item"}">
+    <tr class="tool-row" data-index="${i}" data-type="item">
       <td class="drag-cell">
         <span class="drag-handle" title="Drag to reorder" style="cursor:grab; user-select:none;">⋮⋮</span>
       </td>
@@ -117,71 +216,8 @@ function render() {
     tr.addEventListener("click", () => selectRow(+tr.dataset.index));
   });
 
-  // ! Pointer-driven drag (robust in Qt WebEngine)
-  tbody.addEventListener('mousedown', (e) => {
-    const handle = e.target.closest('.drag-handle');
-    if (!handle) return; // only start from handle
-    const tr = handle.closest('tr.tool-row');
-    if (!tr) return;
-    if (tr.dataset.type === 'separator') return; // no dragging separators
-
-    _isDragging = true;
-    _dragStartIndex = +tr.dataset.index;
-    _draggingEl = tr;
-    tr.classList.add('dragging');
-    document.body.classList.add('mt-grabbing');
-
-    // show marker just after the current row initially
-    _placeMarkerBefore(tbody, tr.nextElementSibling);
-    e.preventDefault();
-  });
-
-  // move marker with pointer
-  const _onMouseMove = (e) => {
-    if (!_isDragging || !_draggingEl) return;
-    const afterEl = getDragAfterElement(tbody, e.clientY);
-    _placeMarkerBefore(tbody, afterEl);
-  };
-
-  // commit on mouse up anywhere
-  const _onMouseUp = (e) => {
-    if (!_isDragging || !_draggingEl) return;
-
-    _isDragging = false;
-
-    const rows = [...tbody.querySelectorAll('tr.tool-row')];
-    let insertIndex = rows.length; // default to end
-    if (_markerEl && _markerEl.parentNode === tbody) {
-      const next = _markerEl.nextElementSibling;
-      if (next && next.classList.contains('tool-row')) {
-        insertIndex = rows.indexOf(next);
-      }
-    }
-
-    const from = _dragStartIndex;
-    let to = insertIndex;
-    if (from < to) to -= 1;
-
-    const [moved] = model.splice(from, 1);
-    model.splice(to, 0, moved);
-
-    if (_draggingEl) _draggingEl.classList.remove('dragging');
-    _draggingEl = null;
-    _dragStartIndex = null;
-    document.body.classList.remove('mt-grabbing');
-    _removeMarker();
-
-    // re-render and select moved row
-    render();
-    selectRow(to);
-  };
-
-  // attach document-level listeners once per render (idempotent)
-  // remove pre-existing to avoid duplicates
-  document.removeEventListener('mousemove', _onMouseMove);
-  document.removeEventListener('mouseup', _onMouseUp);
-  document.addEventListener('mousemove', _onMouseMove);
-  document.addEventListener('mouseup', _onMouseUp);
+  // ! Pointer-driven drag (robust in Qt WebEngine); listeners are bound once, not per render
+  _bindDragHandlers(tbody);
 
   // focusing an input selects the row
   tbody.querySelectorAll('input').forEach(inp => {
@@ -244,10 +280,14 @@ function onSave() {
   pycmd("toolbar_editor:save:" + payload);
 }
 
-function hydrate(jsonStr) {
-  try {
-    model = JSON.parse(jsonStr);
-  } catch(e) { model = []; }
+function hydrate(data) {
+  // Python passes the array literal directly; a JSON string is still accepted
+  if (typeof data === 'string') {
+    try {
+      data = JSON.parse(data);
+    } catch(e) { data = []; }
+  }
+  model = Array.isArray(data) ? data : [];
   render();
 }
 
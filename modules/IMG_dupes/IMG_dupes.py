@@ -7,6 +7,25 @@ from anki.notes import Note
 from typing import List
 import re
 
+# Compiled once; reused for every note/field in the scan below
+_IMG_RE = re.compile(r'<img [^>]*src="([^"]+)"[^>]*>', re.IGNORECASE)
+
+def _dedupe_imgs(html):
+    """Drop repeated <img> tags (same src) in one pass; returns (new_html, changed)."""
+    seen = set()
+    changed = False
+
+    def repl(m):
+        nonlocal changed
+        src = m.group(1)
+        if src in seen:
+            changed = True
+            return ""
+        seen.add(src)
+        return m.group(0)
+
+    return _IMG_RE.sub(repl, html), changed
+
 def run_img_dupes_script():
     print("🚀 Starting AC_IMG_DUPES inside Anki...")
 
@@ -20,6 +39,7 @@ def run_img_dupes_script():
         return
 
     removed_nids: List[int] = []
+    changed_notes: List[Note] = []
     for nid in note_ids:
         note: Note = mw.col.get_note(nid)
         changed = False
@@ -28,37 +48,24 @@ def run_img_dupes_script():
             if field not in note:
                 continue
             original = note[field]
+            # Cheap substring check skips the regex for fields without images (any tag case, like _IMG_RE)
+            if "<img" not in original.lower():
+                continue
 
-            # Extract all <img> tags
-            imgs = re.findall(r'<img [^>]*src="([^"]+)"[^>]*>', original, flags=re.IGNORECASE)
-            if not imgs or len(set(imgs)) == len(imgs):
-                continue  # No dupes
-
-            seen = set()
-            updated_html = ""
-            split = re.split(r'(<img [^>]*src="[^"]+"[^>]*>)', original)
-
-            for chunk in split:
-                match = re.search(r'<img [^>]*src="([^"]+)"[^>]*>', chunk)
-                if match:
-                    src = match.group(1)
-                    if src not in seen:
-                        updated_html += chunk
-                        seen.add(src)
-                    else:
-                        changed = True  # This is a duplicate <img>, skip it
-                else:
-                    updated_html += chunk
-
-            if updated_html != original:
+            updated_html, changed_field = _dedupe_imgs(original)
+            if changed_field:
                 print(f"🧹 Removed dupes in field '{field}' of note {nid}")
                 note[field] = updated_html
                 changed = True
 
         if changed:
-            note.flush()
+            changed_notes.append(note)
             removed_nids.append(nid)
 
+    # Write every modified note back in one backend call instead of a flush per note
+    if changed_notes:
+        mw.col.update_notes(changed_notes)
+
     msg = f"✅ Done. Cleaned {len(removed_nids)} notes."
     print(msg)
     showInfo(msg)
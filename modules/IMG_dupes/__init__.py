@@ -9,11 +9,19 @@ from aqt.operations import Progress, QueryOp
 from typing import List
 import re
 
+# Compiled once; reused for every note/field in process_notes
+_IMG_RE = re.compile(r'<img [^>]*src="([^"]+)"[^>]*>', re.IGNORECASE)
+
+# Fields scanned for duplicate images (when the note type has them)
+_TARGET_FIELDS = {'Text', 'Extra', 'Extra2', 'Extra3', 'Extra4', 'Extra5', 'Button', 'Display'}
+
 def normalize_tag_input(raw: str) -> str:
-    tag = raw.strip().replace("\\_", "_")
-    if not tag.startswith("tag:"):
-        tag = f"tag:{tag}"
-    return tag
+    tag = raw.strip()
+    if "\\_" in tag:
+        tag = tag.replace("\\_", "_")
+    if tag.startswith("tag:"):
+        return tag
+    return "tag:" + tag
 
 def run_img_dupes_script():
     print("🚀 Starting AC_IMG_DUPES inside Anki...")
@@ -33,6 +41,8 @@ def run_img_dupes_script():
     if not query.strip():
         return
 
+    # Let the backend drop notes without any <img before they reach Python
+    query = f'({query}) "<img"'
     note_ids = mw.col.find_notes(query)
     print(f"📌 Found {len(note_ids)} notes matching query: {query}")
 
@@ -42,48 +52,61 @@ def run_img_dupes_script():
 
     def process_notes(col):
         removed_nids = []
+        modified_notes = []
+        # mid -> [(field name, index)] of target fields, resolved once per note type
+        model_fields = {}
+        # note_ids already only holds notes containing <img (see the search above)
         for nid in note_ids:
             note: Note = col.get_note(nid)
             changed = False
 
-            for field in ['Text', 'Extra', 'Extra2', 'Extra3', 'Extra4', 'Extra5', 'Button', 'Display']:
-                if field not in note:
-                    continue
-                original = note[field]
+            fields_to_check = model_fields.get(note.mid)
+            if fields_to_check is None:
+                names = col.models.field_names(col.models.get(note.mid))
+                fields_to_check = [(n, i) for i, n in enumerate(names) if n in _TARGET_FIELDS]
+                model_fields[note.mid] = fields_to_check
 
-                imgs = re.findall(r'<img [^>]*src="([^"]+)"[^>]*>', original, flags=re.IGNORECASE)
-                if not imgs or len(set(imgs)) == len(imgs):
+            for field, idx in fields_to_check:
+                original = note.fields[idx]
+                # Match any tag case, like the IGNORECASE _IMG_RE below
+                if "<img" not in original.lower():
                     continue
 
+                # Single pass: copy text between tags, keep only the first tag per src
+                parts = []
+                cursor = 0
                 seen = set()
-                updated_html = ""
-                split = re.split(r'(<img [^>]*src="[^"]+"[^>]*>)', original)
-
-                for chunk in split:
-                    match = re.search(r'<img [^>]*src="([^"]+)"[^>]*>', chunk)
-                    if match:
-                        src = match.group(1)
-                        if src not in seen:
-                            updated_html += chunk
-                            seen.add(src)
-                        else:
-                            changed = True
+                changed_field = False
+                for m in _IMG_RE.finditer(original):
+                    src = m.group(1)
+                    parts.append(original[cursor:m.start()])
+                    if src not in seen:
+                        parts.append(m.group(0))
+                        seen.add(src)
                     else:
-                        updated_html += chunk
+                        changed_field = True
+                    cursor = m.end()
 
-                if updated_html != original:
+                if changed_field:
+                    parts.append(original[cursor:])
+                    updated_html = "".join(parts)
                     print(f"🧹 Removed dupes in field '{field}' of note {nid}")
-                    note[field] = updated_html
+                    note.fields[idx] = updated_html
                     changed = True
 
             if changed:
-                try:
-                    note.flush()
-                    removed_nids.append(nid)
-                except Exception as e:
-                    msg = f"❌ Error flushing note {nid}: {e}"
-                    print(msg)
-                    showWarning(msg)
+                modified_notes.append(note)
+                removed_nids.append(nid)
+
+        # Submit all edits as one backend write instead of a flush per note
+        if modified_notes:
+            try:
+                col.update_notes(modified_notes)
+            except Exception as e:
+                msg = f"❌ Error updating {len(modified_notes)} notes: {e}"
+                print(msg)
+                showWarning(msg)
+                return []
         return removed_nids
 
     def on_success(removed_nids):
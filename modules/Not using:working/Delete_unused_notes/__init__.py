@@ -6,6 +6,12 @@ import json
 from pathlib import Path
 from typing import Dict, Any
 
+# ? orjson is optional; parse the raw bytes in C when it is available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Path to the central Change_notes config.json
 CONFIG_PATH = Path("/Users/claytongoddard/Library/Application Support/Anki2/addons21/Change_notes/config.json")
 
@@ -15,19 +21,32 @@ def _default_cfg() -> Dict[str, Any]:
         "confirm": True,
     }
 
+# (mtime_ns, parsed cfg) from the last successful read; reused while the file is unchanged
+_CFG_CACHE: tuple[int, Dict[str, Any]] | None = None
+
 def _load_delete_cfg() -> Dict[str, Any]:
+    global _CFG_CACHE
     defaults = _default_cfg()
     try:
-        if CONFIG_PATH.exists():
+        mtime_ns = CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        return defaults
+    if _CFG_CACHE is not None and _CFG_CACHE[0] == mtime_ns:
+        return _CFG_CACHE[1]
+    try:
+        if orjson is not None:
+            data = orjson.loads(CONFIG_PATH.read_bytes())
+        else:
             data = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
-            sect = data.get("delete_empty_notes_config", {})
-            return {
-                "protected_notes": list(sect.get("protected_notes", defaults["protected_notes"])),
-                "confirm": bool(sect.get("confirm", defaults["confirm"]))
-            }
+        sect = data.get("delete_empty_notes_config", {})
+        cfg = {
+            "protected_notes": list(sect.get("protected_notes", defaults["protected_notes"])),
+            "confirm": bool(sect.get("confirm", defaults["confirm"]))
+        }
     except Exception:
-        pass
-    return defaults
+        return defaults
+    _CFG_CACHE = (mtime_ns, cfg)
+    return cfg
 
 def delete_empty_note_types() -> None:
     """Delete all note types (models) that currently have zero cards.
@@ -41,17 +60,19 @@ def delete_empty_note_types() -> None:
     protected = set(cfg.get("protected_notes", []))
 
     models = col.models.all()
+    by_name = {m.get("name", ""): m for m in models}
     to_delete_names = []
 
+    # One aggregate query for every note type that still has cards
+    used_mids = set(col.db.list(
+        "SELECT DISTINCT notes.mid FROM notes JOIN cards ON cards.nid = notes.id"
+    ))
+
     for model in models:
         model_name = model.get("name", "")
         if model_name in protected:
             continue
-        count = col.db.scalar(
-            "SELECT COUNT() FROM cards WHERE nid IN (SELECT id FROM notes WHERE mid=?)",
-            model["id"],
-        )
-        if count == 0:
+        if model["id"] not in used_mids:
             to_delete_names.append(model_name)
 
     if not to_delete_names:
@@ -65,7 +86,6 @@ def delete_empty_note_types() -> None:
             showInfo("Deletion cancelled.")
             return
 
-    by_name = {m.get("name", ""): m for m in col.models.all()}
     deleted = 0
     for name in to_delete_names:
         m = by_name.get(name)
@@ -1,9 +1,11 @@
 
 import os
 import re
+import shutil
 import sqlite3
 from aqt import mw
 from aqt.utils import showInfo
+from aqt.operations import QueryOp
 
 # --- CONFIG ---
 # If enabled, only scan notes that have the specific tag (exact match, normalized by Anki)
@@ -13,6 +15,9 @@ TAG_NAME = "missing-media"  # The tag to filter notes by when TAG_FILTER_ENABLED
 # Media extensions to look for inside note fields
 MEDIA_EXTENSIONS = {".png", ".jpg", ".jpeg", ".svg", ".gif", ".mp3", ".mp4"}
 
+# Compiled once for the scan in normalize_refs; \x1f is excluded so a match never spans two fields
+_SRC_RE = re.compile(r'src="([^"\x1f]+)"', re.IGNORECASE)
+
 
 
 def write_missing_file():
@@ -26,9 +31,11 @@ def write_missing_file():
         - Returns only basenames that end with a known extension.
         """
         refs = set()
+        # str.endswith accepts a tuple, checking every extension in one C call
+        ext_tuple = tuple(extensions)
 
         # Pull out src="...".
-        for m in re.findall(r'(?i)src="([^"]+)"', text):
+        for m in _SRC_RE.findall(text):
             url = m.strip()
 
             # Decode %20, etc.
@@ -37,59 +44,61 @@ def write_missing_file():
             # Strip query/hash
             path = urlparse(url).path
 
-            # If CSS or junk is appended after extension, clip at the extension.
-            for ext in extensions:
-                if path.lower().endswith(ext):
-                    i = path.lower().rfind(ext)
-                    if i != -1:
-                        path = path[: i + len(ext)]
-                    break
-
-            base = os.path.basename(path)
+            base = path.rpartition("/")[2]  # URL paths always use "/"
 
-            if any(base.lower().endswith(ext) for ext in extensions):
+            if base.lower().endswith(ext_tuple):
                 refs.add(base)
 
         return refs
 
-    def get_used_media(tag: str | None = None) -> set[str]:
+    def get_used_media(col, tag: str | None = None) -> set[str]:
         """Return a set of media filenames referenced in notes.
         If `tag` is provided, only notes containing that tag are scanned.
         Anki stores tags as a space-padded, normalized string in `notes.tags`.
         We therefore search using a LIKE pattern with spaces on both sides.
         """
-        db = mw.col.db
+        db = col.db
+        # Only pull rows with a src= attribute and a media extension; the rest can't add refs
+        ext_filter = "flds LIKE '%src=%' AND (" + " OR ".join("flds LIKE ?" for _ in MEDIA_EXTENSIONS) + ")"
+        ext_params = [f"%{ext}%" for ext in MEDIA_EXTENSIONS]
         if tag:
             # Match the exact tag within the space-padded tags string
             like_pat = f"% {tag} %"
-            rows = db.all("SELECT flds FROM notes WHERE tags LIKE ?", like_pat)
+            rows = db.all(
+                f"SELECT flds FROM notes WHERE tags LIKE ? AND ({ext_filter})",
+                like_pat, *ext_params,
+            )
         else:
-            rows = db.all("SELECT flds FROM notes")
+            rows = db.all(f"SELECT flds FROM notes WHERE {ext_filter}", *ext_params)
 
         used = set()
         for (flds,) in rows:
-            for field in flds.split("\x1f"):
-                used |= normalize_refs(field, MEDIA_EXTENSIONS)
+            # Scan the whole field blob at once instead of splitting on \x1f
+            used |= normalize_refs(flds, MEDIA_EXTENSIONS)
         return used
 
-    def get_existing_media():
-        return set(os.listdir(mw.col.media.dir()))
+    def get_existing_media(col):
+        with os.scandir(col.media.dir()) as entries:
+            return frozenset(e.name for e in entries)
 
-    def export_missing_media(tag: str | None = None):
-        used = get_used_media(tag)
-        existing = get_existing_media()
+    def export_missing_media(col, profile_name: str, tag: str | None = None):
+        used = get_used_media(col, tag)
+        existing = get_existing_media(col)
         missing = used - existing
 
         output_dir = os.path.expanduser("~/Desktop/Missing Media files")
         os.makedirs(output_dir, exist_ok=True)
 
-        profile_name = mw.pm.name
         output_file = os.path.join(output_dir, f"missing_media_{profile_name}.txt")
 
+        # Sort and encode once; the backup reuses the same bytes
+        payload = "".join(name + "\n" for name in sorted(missing))
+
+        wrote_primary = False
         try:
             with open(output_file, "w", encoding="utf-8") as f:
-                for name in sorted(missing):
-                    f.write(name + "\n")
+                f.write(payload)
+            wrote_primary = True
         except Exception as e:
             print(f"❌ Failed to write missing media file: {e}")
 
@@ -98,9 +107,11 @@ def write_missing_file():
         backup_file = os.path.join(backup_dir, f"missing_media_{profile_name}.txt")
 
         try:
-            with open(backup_file, "w", encoding="utf-8") as f:
-                for name in sorted(missing):
-                    f.write(name + "\n")
+            if wrote_primary:
+                shutil.copyfile(output_file, backup_file)
+            else:
+                with open(backup_file, "w", encoding="utf-8") as f:
+                    f.write(payload)
         except Exception as e:
             print(f"❌ Failed to write backup missing media file: {e}")
 
@@ -111,14 +122,24 @@ def write_missing_file():
         effective_tag = None
         if TAG_FILTER_ENABLED and isinstance(TAG_NAME, str) and TAG_NAME.strip():
             effective_tag = TAG_NAME.strip()
-        
-        path, count, used_tag_scope = export_missing_media(effective_tag)
-        scope_text = f"only notes tagged '{effective_tag}'" if used_tag_scope else "all notes"
-        showInfo(
-            "✅ Missing media check complete.\n\n"
-            f"🔎 Scanned: {scope_text}\n"
-            f"📦 {count} missing files saved to:\n{path}"
-        )
+
+        # Read profile state on the main thread; the scan itself runs in the background
+        profile_name = mw.pm.name
+
+        def on_success(result):
+            path, count, used_tag_scope = result
+            scope_text = f"only notes tagged '{effective_tag}'" if used_tag_scope else "all notes"
+            showInfo(
+                "✅ Missing media check complete.\n\n"
+                f"🔎 Scanned: {scope_text}\n"
+                f"📦 {count} missing files saved to:\n{path}"
+            )
+
+        QueryOp(
+            parent=mw,
+            op=lambda col: export_missing_media(col, profile_name, effective_tag),
+            success=on_success,
+        ).with_progress("Scanning notes and media folder...").run_in_background()
 
     run_missing_media_check()
 
@@ -7,17 +7,18 @@ from __future__ import annotations
 
 # pyright: reportMissingImports=false
 # mypy: disable_error_code=import
-import os, json, traceback
+import os, json, shutil, traceback
 from typing import Any, Dict
 
 from aqt.qt import (
-    QDialog, QVBoxLayout, Qt, QTimer, QCursor, QMenu, QWebEngineView
+    QDialog, QVBoxLayout, Qt, QTimer, QCursor, QMenu, QWebEngineView, sip
 )
 from aqt.webview import AnkiWebView
+from aqt.operations import QueryOp
 from aqt.utils import showInfo, showText
 from aqt import gui_hooks
 
-from .utils import _refresh_menu
+from .utils import CONFIG, _refresh_menu, load_json_cached, dump_json_bytes
 
 # --- Paths & constants ---
 ADDON_DIR = os.path.dirname(__file__)
@@ -29,6 +30,9 @@ CSS_PATH = os.path.join(ASSETS, "toolbar_style.css")
 JS_PATH  = os.path.join(ASSETS, "toolbar_script.js")
 DEVTOOLS_WINDOW_TITLE = "Toolbar DevTools"
 
+# Row names the editor treats as dividers (saved with type="separator")
+_DIVIDER_NAMES = frozenset(("---", "—", "——", "———", "————", "—————"))
+
 # * Sentinel & helper to keep 'Toolbar Settings' OUT of actions.json and the table
 TOOLBAR_SETTINGS_SENTINEL = {
     "name": "Toolbar Settings",
@@ -45,13 +49,6 @@ def _is_toolbar_settings(entry: Dict[str, Any]) -> bool:
         and (entry or {}).get("function") == TOOLBAR_SETTINGS_SENTINEL["function"]
     )
 
-# Load config (labels, defaults)
-try:
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        CONFIG = json.load(f)
-except Exception:
-    CONFIG = {"toolbar_title": "Toolbar Editor"}
-
 # Keep handles to the editor view and the DevTools window so we can attach DevTools
 _toolbar_view: AnkiWebView | None = None
 _toolbar_devtools: QWebEngineView | None = None
@@ -59,6 +56,21 @@ _toolbar_devtools: QWebEngineView | None = None
 # Keep a reference to the open dialog when modeless
 _TOOLBAR_DIALOG = None
 
+# path -> (mtime_ns, text) for the HTML/CSS/JS assets; re-read only when a file changes
+_ASSET_CACHE: Dict[str, tuple[int, str]] = {}
+
+
+def _read_asset(path: str) -> str:
+    """Return a text asset's contents, reusing the cached copy while its mtime is unchanged."""
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _ASSET_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    _ASSET_CACHE[path] = (mtime_ns, text)
+    return text
+
 
 class ToolbarEditorDialog(QDialog):
     """Modeless dialog hosting an AnkiWebView UI for toolbar editing."""
@@ -102,16 +114,14 @@ class ToolbarEditorDialog(QDialog):
     # --- I/O helpers ---
     def _read_html(self) -> str:
         try:
-            with open(HTML_PATH, "r", encoding="utf-8") as f:
-                return f.read()
+            return _read_asset(HTML_PATH)
         except Exception:
             showText(traceback.format_exc(), title="Load HTML Error")
             return "<div>Failed to load toolbar.html</div>"
 
     def _read_text(self, path: str) -> str:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return f.read()
+            return _read_asset(path)
         except Exception:
             showText(traceback.format_exc(), title=f"Load Error: {os.path.basename(path)}")
             return ""
@@ -119,11 +129,11 @@ class ToolbarEditorDialog(QDialog):
     def _load_actions(self) -> list[Dict[str, Any]]:
         try:
             if os.path.exists(ACTIONS_PATH):
-                with open(ACTIONS_PATH, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # ! Keep the hard-coded item out of the editor grid
-                    data = [e for e in (data or []) if not _is_toolbar_settings(e)]
-                    return data
+                # ^ Reuses the marshal sidecar while actions.json is unchanged (fresh objects each call)
+                data = load_json_cached(ACTIONS_PATH)
+                # ! Keep the hard-coded item out of the editor grid
+                data = [e for e in (data or []) if not _is_toolbar_settings(e)]
+                return data
         except Exception:
             showText(traceback.format_exc(), title="Load Actions Error")
         return []
@@ -149,11 +159,9 @@ class ToolbarEditorDialog(QDialog):
             return path
 
     def _inject_model(self, data: list[Dict[str, Any]]) -> None:
-        # Pass JSON string to JS hydrate(jsonStr)
-        payload = json.dumps(data)
-        # Double-encode so quotes are preserved inside JS call
-        js = f"hydrate({json.dumps(payload)});"
-        self.view.eval(js)
+        # JSON is a valid JS literal, so encode once and pass the array straight to hydrate()
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        self.view.eval(f"hydrate({payload});")
 
     # --- Bridge ---
     def _on_bridge(self, cmd: str) -> None:
@@ -171,33 +179,69 @@ class ToolbarEditorDialog(QDialog):
             return
 
         if action == "save":
-            try:
-                tools = json.loads(rest)
-                # Normalize separators and prefer SVG icons
-                for e in tools:
-                    # Prefer .svg over .png when available
-                    icon_path = e.get("icon") or ""
-                    if icon_path:
-                        e["icon"] = self._prefer_svg_path(icon_path)
-                    name = (e.get("name") or "").strip()
-                    if name in ("---", "—", "——", "———", "————", "—————"):
-                        e["type"] = "separator"
-                    else:
-                        e.pop("type", None)
-                # ? Ensure the hard-coded item never gets saved
-                clean_tools = [e for e in tools if not _is_toolbar_settings(e)]
-                # Backup + write
-                if os.path.exists(ACTIONS_PATH):
-                    os.replace(ACTIONS_PATH, ACTIONS_PATH + ".bak")
-                with open(ACTIONS_PATH, "w", encoding="utf-8") as f:
-                    json.dump(clean_tools, f, indent=2)
-                _refresh_menu()
-                showInfo("Saved. Reopen the Tools menu to see changes.")
-                # ^ Re-hydrate with the filtered model so the row never reappears
-                self._inject_model(clean_tools)
-            except Exception:
-                showText(traceback.format_exc(), title="Save Error")
+            # ^ Parse, normalize and write off the UI thread; the menu/UI update runs on success.
+            #   File-only work, so don't take the collection lock (or require an open collection)
+            QueryOp(
+                parent=self,
+                op=lambda _col: self._save_actions(rest),
+                success=self._on_saved,
+            ).failure(self._on_save_failed).without_collection().run_in_background()
+
+    def _save_actions(self, rest: str) -> tuple[list[Dict[str, Any]], bool]:
+        """Parse the page's JSON, normalize it and write actions.json. Runs in the background."""
+        tools = json.loads(rest)
+        # Single pass: drop the hard-coded item, normalize separators, prefer SVG icons
+        clean_tools = []
+        normalized = False  # did anything differ from what the page sent?
+        for e in tools:
+            # ? Ensure the hard-coded item never gets saved
+            if _is_toolbar_settings(e):
+                normalized = True
+                continue
+            # Prefer .svg over .png when available
+            icon_path = e.get("icon") or ""
+            if icon_path:
+                svg_path = self._prefer_svg_path(icon_path)
+                if svg_path != icon_path:
+                    e["icon"] = svg_path
+                    normalized = True
+            name = (e.get("name") or "").strip()
+            if name in _DIVIDER_NAMES:
+                if e.get("type") != "separator":
+                    e["type"] = "separator"
+                    normalized = True
+            elif "type" in e:
+                del e["type"]
+                normalized = True
+            clean_tools.append(e)
+        # Encode once (orjson when available) and hand the file a single write
+        data = dump_json_bytes(clean_tools)
+        # Write to a temp file, back up the old copy, then atomically swap in the new one
+        tmp_path = ACTIONS_PATH + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        if os.path.exists(ACTIONS_PATH):
+            # Keep the existing file's permissions across the swap
+            shutil.copymode(ACTIONS_PATH, tmp_path)
+            shutil.copyfile(ACTIONS_PATH, ACTIONS_PATH + ".bak")
+        os.replace(tmp_path, ACTIONS_PATH)
+        # ^ Rebuild the marshal sidecar now so the next startup skips JSON parsing
+        load_json_cached(ACTIONS_PATH)
+        return clean_tools, normalized
+
+    def _on_saved(self, result: tuple[list[Dict[str, Any]], bool]) -> None:
+        clean_tools, normalized = result
+        _refresh_menu()
+        showInfo("Saved. Reopen the Tools menu to see changes.")
+        # ! The dialog deletes itself on close, which may have happened while the save ran
+        if sip.isdeleted(self) or sip.isdeleted(self.view):
+            return
+        # ^ The page already holds this model; only re-hydrate if saving changed it
+        if normalized:
+            self._inject_model(clean_tools)
 
+    def _on_save_failed(self, exc: Exception) -> None:
+        showText("".join(traceback.format_exception(type(exc), exc, exc.__traceback__)), title="Save Error")
 
 
 # --- DevTools context menu hook (right-click → Inspect) ---
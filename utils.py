@@ -3,27 +3,101 @@
 # pyright: reportMissingImports=false
 # mypy: disable_error_code=import
 import os
+import sys
 import json
+import types
+import marshal
+import functools
+from contextlib import contextmanager
 from aqt import mw
-from aqt.qt import QAction, QMenu, QIcon
+from aqt.qt import QAction, QMenu, QIcon, QTimer
 from aqt.utils import showText
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 from typing import Optional
 _submenu_cache: "OrderedDict[str, object]" = OrderedDict()  # submenu_name -> QMenu
 
+# ? One registered toolbar action
+ToolEntry = namedtuple("ToolEntry", "name callback icon enabled")
+
+# ? A tool definition as produced by build_config_tools (register_addon_tool's keyword names)
+ToolDef = namedtuple("ToolDef", "name callback submenu_name icon enabled")
+
 # ? Stores registered toolbar actions, grouped by submenu path (e.g., "Top::Sub::Leaf")
-addon_actions = {}
+addon_actions: "dict[str, list[ToolEntry]]" = {}
+
+# ? Top-level menu titles of every registered tool, maintained by register_addon_tool
+_known_top_titles: "set[str]" = set()
+
+# ? True while a coalesced _refresh_menu() is queued on the event loop
+_refresh_pending = False
+
+# ? Nesting depth of batch_register(); while > 0, registrations only mark the menus dirty
+_refresh_suspended = 0
+_batch_dirty = False
+
+# ? orjson is optional; when Anki's bundled Python has it, parse JSON in C
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load and return JSON data from a file path
 def load_json_file(path):
     """Load and return JSON data from the given file path."""
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # Bulk-read raw bytes; both parsers decode UTF-8 bytes directly
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def dump_json_bytes(data) -> bytes:
+    """Serialize data as 2-space-indented UTF-8 JSON, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+def load_json_cached(path):
+    """
+    Load JSON data via a marshal sidecar ('<path>.cache') that is reused only while
+    the source file's (mtime_ns, size) still match the values recorded in it.
+    """
+    cache_path = path + ".cache"
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_stamp, data = marshal.load(f)
+        if cached_stamp == stamp:
+            return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    data = load_json_file(path)
+    # Write to a temp file then swap in, so a crash never leaves a torn cache
+    tmp_path = cache_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            marshal.dump((stamp, data), f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError):
+        pass
+    return data
 
  # ? Global configuration loaded from ./assets/config.json
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "assets", "config.json")
-CONFIG = load_json_file(CONFIG_PATH)
+# ^ Read-only view so callers can't mutate shared settings
+CONFIG = types.MappingProxyType(load_json_cached(CONFIG_PATH))  # marshal sidecar skips the parse on unchanged startups
+
+# ? Top-level menu title, resolved once
+TOOLBAR_TITLE = CONFIG.get("toolbar_title", "Custom Tools")
 
+# ? Add-on directories used by resolve_icon_path, computed once at import
+_ADDON_DIR = os.path.dirname(__file__)
+_ASSETS_DIR = os.path.join(_ADDON_DIR, "assets")
+_ICONS_DIR = os.path.join(_ADDON_DIR, "icons")
+
+@functools.lru_cache(maxsize=256)
 def resolve_icon_path(path):
     """
     Resolve icon path based on relative logic:
@@ -36,21 +110,32 @@ def resolve_icon_path(path):
     if not path:
         return ""
 
+    # ':' is never absolute, so settle the resource cases before touching os.path
+    if path[0] == ":":
+        if path.startswith(":assets/"):
+            return os.path.join(_ASSETS_DIR, path[8:])
+        return path
+
+    # Most configured icons are "icons/..." or "assets/..."; neither prefix can be absolute
+    if path.startswith(("assets/", "icons/")):
+        return os.path.join(_ADDON_DIR, path)
+
     if os.path.isabs(path):
         return path
 
-    addon_dir = os.path.dirname(__file__)
+    return os.path.join(_ICONS_DIR, path)
 
-    if path.startswith(":assets/"):
-        return os.path.join(addon_dir, "assets", path.replace(":assets/", ""))
 
-    if path.startswith(":"):
-        return path
+@functools.lru_cache(maxsize=None)
+def _icon_for(path):
+    """Return a shared QIcon for an icon path so each file is only loaded once."""
+    return QIcon(resolve_icon_path(path))
 
-    if path.startswith("assets/") or path.startswith("icons/"):
-        return os.path.join(addon_dir, path)
 
-    return os.path.join(addon_dir, "icons", path)
+@functools.lru_cache(maxsize=256)
+def _split_path(submenu_path: str) -> "tuple[str, ...]":
+    """Split a '::' submenu path once; rebuilds reuse the cached tuple."""
+    return tuple(submenu_path.split("::")) if submenu_path else ()
 
 
 def format_config_label(addon: str, config: dict) -> str:
@@ -59,9 +144,11 @@ def format_config_label(addon: str, config: dict) -> str:
       [emoji␠][nickname OR prettified addon name]
     where nickname is sourced from config["addon_nicknames"].
     """
-    emojis = (config.get("addon_emojis") or {})
-    nicknames = (config.get("addon_nicknames") or {})
+    return _format_label(addon, config.get("addon_emojis") or {}, config.get("addon_nicknames") or {})
+
 
+def _format_label(addon: str, emojis: dict, nicknames: dict) -> str:
+    """format_config_label with the emoji/nickname maps already looked up."""
     emoji = emojis.get(addon, "") or ""
     # Prefer nickname if provided; fall back to prettified addon key
     display = nicknames.get(addon) or addon.replace("_", " ").replace("-", " ").title()
@@ -69,48 +156,141 @@ def format_config_label(addon: str, config: dict) -> str:
     return f"{emoji} {display}" if emoji else display
 
 
+ # ? menu -> {child title: child QMenu}; kept across calls so incremental adds can find submenus
+_submenu_index: "dict[QMenu, dict[str, QMenu]]" = {}
+
+# ? True once _refresh_menu() has built the menus at least once
+_menus_built = False
+
+# ? menu -> [(action, icon path)] still waiting for setIcon; applied when the menu first opens
+_pending_icons: "dict[QMenu, list[tuple[QAction, str]]]" = {}
+
+
+def _apply_pending_icons(menu: QMenu) -> None:
+    """Set the deferred icons of a menu's own actions (submenus defer theirs until they open)."""
+    for action, icon in _pending_icons.pop(menu, ()):
+        action.setIcon(_icon_for(icon))
+
+
+def _new_menu(title: str) -> QMenu:
+    """Create a tool menu whose action icons are loaded lazily on aboutToShow."""
+    menu = QMenu(title, mw)
+    menu.aboutToShow.connect(lambda m=menu: _apply_pending_icons(m))
+    return menu
+
+
+# ? (top, *submenus, name) -> [(entry, QAction)] as last built; lets a rebuild keep its actions
+_built_actions: "dict[tuple[str, ...], list[tuple[ToolEntry, QAction]]]" = {}
+
+
+# Walk (creating as needed) the '::' submenu path, then add the leaf action
+def _add_nested_action(menu: QMenu, top: str, path: "tuple[str, ...]", entry: ToolEntry, previous=None):
+    for head in path:
+        children = _submenu_index.setdefault(menu, {})
+        sub = children.get(head)
+        if sub is None:
+            sub = _new_menu(head)
+            menu.addMenu(sub)
+            children[head] = sub
+        menu = sub
+
+    key = (top, *path, entry.name)
+    # ^ Reuse the previous build's QAction for this slot; only rewire when the callback changed
+    stale = previous.get(key) if previous else None
+    if stale:
+        old_entry, action = stale.pop(0)
+        if old_entry.callback != entry.callback:
+            action.triggered.disconnect()
+            action.triggered.connect(entry.callback)
+        if old_entry.icon and not entry.icon:
+            action.setIcon(QIcon())
+    else:
+        action = QAction(entry.name, mw)
+        action.triggered.connect(entry.callback)
+    action.setEnabled(entry.enabled)
+    if entry.icon:
+        # ^ Don't decode the icon until someone actually opens this menu
+        _pending_icons.setdefault(menu, []).append((action, entry.icon))
+    menu.addAction(action)
+    _built_actions.setdefault(key, []).append((entry, action))
+
+
  # ? Rebuild "Custom Tools" menus based on current registrations (supports '::' nesting)
 def _refresh_menu():
     """Rebuilds all top-level menus based on registered addon tools and submenu structure."""
+    global _refresh_pending, _menus_built
+    _refresh_pending = False  # any queued rebuild is satisfied by this one
     # ? Remove existing menus that match the current set of top-level registered names
-    existing_titles = {submenu.split("::")[0] if submenu else CONFIG.get("toolbar_title", "Custom Tools") 
-                       for submenu in addon_actions}
     for action in mw.form.menubar.actions():
-        if action.menu() and action.menu().title() in existing_titles:
+        if action.menu() and action.menu().title() in _known_top_titles:
             mw.form.menubar.removeAction(action)
 
-    # Recursively build nested actions based on '::' submenu structure
-    def add_nested_action(menu: QMenu, path: list[str], name, callback, icon=None, enabled=True):
-        if not path:
-            action = QAction(name, mw)
-            action.triggered.connect(callback)
-            action.setEnabled(enabled)
-            if icon:
-                action.setIcon(QIcon(resolve_icon_path(icon)))
-            menu.addAction(action)
-        else:
-            head, *tail = path
-            sub = next((a.menu() for a in menu.actions() if a.menu() and a.menu().title() == head), None)
-            if not sub:
-                sub = QMenu(head, mw)
-                menu.addMenu(sub)
-            add_nested_action(sub, tail, name, callback, icon, enabled)
-
     # Build top-level menus by grouping tools (preserve first-seen order)
     menu_groups = OrderedDict()
     for submenu_path, actions in addon_actions.items():
-        top = submenu_path.split("::")[0] if submenu_path else CONFIG.get("toolbar_title", "Custom Tools")
+        parts = _split_path(submenu_path)
+        top = parts[0] if parts else TOOLBAR_TITLE
         if top not in menu_groups:
             menu_groups[top] = []
-        menu_groups[top].append((submenu_path, actions))
+        menu_groups[top].append((parts[1:], actions))
 
+    # ! Old menus are parented to mw, so free them explicitly; their QActions live on mw and survive
+    for old_menu in _submenu_cache.values():
+        old_menu.deleteLater()
+    for children in _submenu_index.values():
+        for old_menu in children.values():
+            old_menu.deleteLater()
+    previous = dict(_built_actions)
+    _built_actions.clear()
+    _submenu_cache.clear()
+    _submenu_index.clear()
+    _pending_icons.clear()
     for top_title, grouped in menu_groups.items():
-        top_menu = QMenu(top_title, mw)
-        for submenu_path, actions in grouped:
-            path = submenu_path.split("::")[1:] if submenu_path else []
-            for (name, callback, icon, enabled) in actions:
-                add_nested_action(top_menu, path, name, callback, icon, enabled)
+        top_menu = _new_menu(top_title)
+        _submenu_cache[top_title] = top_menu
+        for path, actions in grouped:
+            for entry in actions:
+                _add_nested_action(top_menu, top_title, path, entry, previous)
+        mw.form.menubar.addMenu(top_menu)
+    # Actions whose tool was removed are no longer in any menu
+    for stale in previous.values():
+        for _, old_action in stale:
+            old_action.deleteLater()
+    _menus_built = True
+
+
+def _append_to_menu(submenu_path: str, entry: ToolEntry) -> None:
+    """Add one action to the live menus, creating its top-level menu/submenus only if missing."""
+    parts = _split_path(submenu_path)
+    top = parts[0] if parts else TOOLBAR_TITLE
+    top_menu = _submenu_cache.get(top)
+    if top_menu is None:
+        top_menu = _new_menu(top)
+        _submenu_cache[top] = top_menu
         mw.form.menubar.addMenu(top_menu)
+    _add_nested_action(top_menu, top, parts[1:], entry)
+
+
+def _flush_refresh():
+    """Run a queued rebuild unless something already refreshed the menus."""
+    if _refresh_pending:
+        _refresh_menu()
+
+
+def _schedule_refresh():
+    """Queue one _refresh_menu() for the next event-loop turn; repeated calls coalesce."""
+    global _refresh_pending
+    if _refresh_pending:
+        return
+    _refresh_pending = True
+    QTimer.singleShot(0, _flush_refresh)
+
+
+def get_toolbar_menu(title):
+    """Return the top-level QMenu built for 'title' by the last refresh, or None."""
+    # Make sure registrations queued in this turn are reflected before handing out the menu
+    _flush_refresh()
+    return _submenu_cache.get(title)
 
 
 # Register a tool into the custom toolbar and refresh the menu
@@ -119,14 +299,55 @@ def register_addon_tool(name, callback, submenu_name: str = "", icon=None, enabl
     * Register a new tool under a submenu. 'submenu_name' can use '::' for nesting.
     ^ If 'order_index' is provided, insert at that position within its submenu list; otherwise append.
     """
-    key = submenu_name or ""
-    items = addon_actions.setdefault(key, [])
+    # Interned so the dict and _split_path cache lookups hit the identity fast path
+    key = sys.intern(submenu_name or "")
+    items = addon_actions.get(key)
+    if items is None:
+        # First tool under this path: remember its top-level title for _refresh_menu's cleanup
+        items = addon_actions[key] = []
+        parts = _split_path(key)
+        _known_top_titles.add(parts[0] if parts else TOOLBAR_TITLE)
+    entry = ToolEntry(name, callback, icon, enabled)
     # Insert at a fixed position when requested (bounds-safe), else append
-    if isinstance(order_index, int) and 0 <= order_index <= len(items):
-        items.insert(order_index, (name, callback, icon, enabled))
+    if isinstance(order_index, int) and 0 <= order_index < len(items):
+        items.insert(order_index, entry)
+        appended = False
     else:
-        items.append((name, callback, icon, enabled))
-    _refresh_menu()
+        items.append(entry)
+        appended = True
+    global _batch_dirty
+    if _refresh_suspended:
+        _batch_dirty = True
+        return
+    # ^ If the menus are live and this entry lands last in build order, a rebuild would only
+    #   append it too, so add it in place; anything else falls back to one coalesced rebuild
+    if _menus_built and not _refresh_pending and appended and next(reversed(addon_actions)) == key:
+        _append_to_menu(key, entry)
+    else:
+        _schedule_refresh()
+
+@contextmanager
+def batch_register():
+    """
+    * Defer menu updates while registering several tools; the menus are rebuilt once on exit.
+    ^ Nests safely; only the outermost block triggers the rebuild.
+    """
+    global _refresh_suspended, _batch_dirty
+    _refresh_suspended += 1
+    try:
+        yield
+    finally:
+        _refresh_suspended -= 1
+        if not _refresh_suspended and _batch_dirty:
+            _batch_dirty = False
+            _refresh_menu()
+
+
+def register_addon_tools(tools):
+    """Register several tools (ToolDefs or dicts of register_addon_tool kwargs) with a single menu rebuild."""
+    with batch_register():
+        for tool in tools:
+            register_addon_tool(**(tool._asdict() if isinstance(tool, ToolDef) else tool))
 
 def build_config_tools(config, make_open_fn):
     """
@@ -136,16 +357,20 @@ def build_config_tools(config, make_open_fn):
         make_open_fn (Callable): Function that returns a callback to open the config dialog.
 
     Returns:
-        List[dict]: List of tool definitions with name, callback, icon, and other display settings.
+        List[ToolDef]: List of tool definitions with name, callback, icon, and other display settings.
     """
-    tools = []
-    for addon in config.get("Other_addon_names", []):
-        label = format_config_label(addon, config)
-        tools.append(dict(
-            name=label,  # includes emoji + nickname fallback
+    icon = config.get("default_icon")
+    submenu_name = config.get("toolbar_title", "Custom Tools") + "::Add-ons Configurations"
+    # Look the label maps up once for the whole list
+    emojis = config.get("addon_emojis") or {}
+    nicknames = config.get("addon_nicknames") or {}
+    return [
+        ToolDef(
+            name=_format_label(addon, emojis, nicknames),  # includes emoji + nickname fallback
             callback=make_open_fn(addon),
-            submenu_name="Addon Configs",
-            icon=config.get("default_icon"),
+            submenu_name=submenu_name,
+            icon=icon,
             enabled=True
-        ))
-    return tools
\ No newline at end of file
+        )
+        for addon in config.get("Other_addon_names", [])
+    ]
\ No newline at end of file